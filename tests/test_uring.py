@@ -0,0 +1,34 @@
+import errno
+import tempfile
+import unittest
+from pathlib import Path
+
+from unzip_cx import _uring
+
+
+class MkdirBatchTest(unittest.TestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+
+    def test_reports_only_new_directories(self) -> None:
+        (self.root / "old").mkdir()
+        paths = [self.root / name for name in ("old", "a", "b")]
+        self.assertEqual(_uring.mkdir_batch(paths), set(paths[1:]))
+        self.assertTrue(all(path.is_dir() for path in paths))
+
+    @unittest.skipIf(_uring._load_liburing() is None, "liburing-ffi 2.4+ is not available")
+    def test_ring_creates_directories(self) -> None:
+        (self.root / "old").mkdir()
+        paths = [self.root / f"d{idx}" for idx in range(_uring.BATCH_SIZE + 3)]
+        results = _uring._mkdir_uring([self.root / "old", *paths], 0o777)
+        self.assertIsNotNone(results)
+        if -errno.EINVAL in results:
+            self.skipTest("kernel does not support IORING_OP_MKDIRAT")
+        self.assertEqual(results, [-errno.EEXIST] + [0] * len(paths))
+        self.assertTrue(all(path.is_dir() for path in paths))
+
+
+if __name__ == "__main__":
+    unittest.main()
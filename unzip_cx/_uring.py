@@ -0,0 +1,218 @@
+"""Optional io_uring backend for creating many destination folders at once."""
+
+from __future__ import annotations
+
+import errno
+import functools
+import os
+import sys
+from pathlib import Path
+from typing import Any, Sequence
+
+AT_FDCWD = -100
+BATCH_SIZE = 64
+MIN_PATHS = 32
+_RING_ENTRIES = BATCH_SIZE
+# The ring layout below is the one shipped by liburing.so.2 since 2.4, the
+# first release with an -ffi build and with runtime version queries.
+_MIN_VERSION = (2, 4)
+
+
+def enabled() -> bool:
+    return sys.platform == "linux" and os.environ.get("UNZIP_CX_URING") == "1"
+
+
+@functools.cache
+def _load_liburing() -> tuple[Any, Any, Any, Any] | None:
+    # ctypes is imported here so that importing this module stays cheap when
+    # the backend is disabled. The prep/get_sqe helpers are static inline in
+    # liburing.h; only the -ffi build exports them as real symbols.
+    import ctypes
+    import ctypes.util
+
+    u32p = ctypes.POINTER(ctypes.c_uint)
+
+    # struct io_uring is allocated by the caller, so it is spelled out field
+    # by field from liburing.h rather than guessed at.
+    class Sq(ctypes.Structure):
+        _fields_ = [
+            ("khead", u32p),
+            ("ktail", u32p),
+            ("kring_mask", u32p),
+            ("kring_entries", u32p),
+            ("kflags", u32p),
+            ("kdropped", u32p),
+            ("array", u32p),
+            ("sqes", ctypes.c_void_p),
+            ("sqe_head", ctypes.c_uint),
+            ("sqe_tail", ctypes.c_uint),
+            ("ring_sz", ctypes.c_size_t),
+            ("ring_ptr", ctypes.c_void_p),
+            ("ring_mask", ctypes.c_uint),
+            ("ring_entries", ctypes.c_uint),
+            ("pad", ctypes.c_uint * 2),
+        ]
+
+    class Cq(ctypes.Structure):
+        _fields_ = [
+            ("khead", u32p),
+            ("ktail", u32p),
+            ("kring_mask", u32p),
+            ("kring_entries", u32p),
+            ("kflags", u32p),
+            ("koverflow", u32p),
+            ("cqes", ctypes.c_void_p),
+            ("ring_sz", ctypes.c_size_t),
+            ("ring_ptr", ctypes.c_void_p),
+            ("ring_mask", ctypes.c_uint),
+            ("ring_entries", ctypes.c_uint),
+            ("pad", ctypes.c_uint * 2),
+        ]
+
+    class Ring(ctypes.Structure):
+        _fields_ = [
+            ("sq", Sq),
+            ("cq", Cq),
+            ("flags", ctypes.c_uint),
+            ("ring_fd", ctypes.c_int),
+            ("features", ctypes.c_uint),
+            ("enter_ring_fd", ctypes.c_int),
+            ("int_flags", ctypes.c_uint8),
+            ("pad", ctypes.c_uint8 * 3),
+            ("pad2", ctypes.c_uint),
+        ]
+
+    # struct io_uring_params is kernel ABI: 120 bytes, zeroed for defaults.
+    class Params(ctypes.Structure):
+        _fields_ = [
+            ("sq_entries", ctypes.c_uint32),
+            ("cq_entries", ctypes.c_uint32),
+            ("flags", ctypes.c_uint32),
+            ("sq_thread_cpu", ctypes.c_uint32),
+            ("sq_thread_idle", ctypes.c_uint32),
+            ("features", ctypes.c_uint32),
+            ("wq_fd", ctypes.c_uint32),
+            ("resv", ctypes.c_uint32 * 3),
+            ("sq_off", ctypes.c_uint32 * 10),
+            ("cq_off", ctypes.c_uint32 * 10),
+        ]
+
+    class Cqe(ctypes.Structure):
+        _fields_ = [
+            ("user_data", ctypes.c_uint64),
+            ("res", ctypes.c_int32),
+            ("flags", ctypes.c_uint32),
+        ]
+
+    if ctypes.sizeof(Params) != 120:
+        return None
+    ring_p = ctypes.POINTER(Ring)
+
+    names = [ctypes.util.find_library("uring-ffi"), "liburing-ffi.so.2"]
+    for name in names:
+        if not name:
+            continue
+        try:
+            lib = ctypes.CDLL(name, use_errno=True)
+        except OSError:
+            continue
+        try:
+            lib.io_uring_major_version.argtypes = []
+            lib.io_uring_minor_version.argtypes = []
+            version = (lib.io_uring_major_version(), lib.io_uring_minor_version())
+        except AttributeError:
+            continue
+        if version[0] != _MIN_VERSION[0] or version < _MIN_VERSION:
+            continue
+        lib.io_uring_queue_init_params.argtypes = [
+            ctypes.c_uint,
+            ring_p,
+            ctypes.POINTER(Params),
+        ]
+        lib.io_uring_queue_exit.argtypes = [ring_p]
+        lib.io_uring_queue_exit.restype = None
+        lib.io_uring_get_sqe.argtypes = [ring_p]
+        lib.io_uring_get_sqe.restype = ctypes.c_void_p
+        lib.io_uring_prep_mkdirat.argtypes = [
+            ctypes.c_void_p,
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint,
+        ]
+        lib.io_uring_prep_mkdirat.restype = None
+        lib.io_uring_sqe_set_data64.argtypes = [ctypes.c_void_p, ctypes.c_uint64]
+        lib.io_uring_sqe_set_data64.restype = None
+        lib.io_uring_submit.argtypes = [ring_p]
+        lib.io_uring_wait_cqe.argtypes = [ring_p, ctypes.POINTER(ctypes.POINTER(Cqe))]
+        lib.io_uring_cqe_seen.argtypes = [ring_p, ctypes.POINTER(Cqe)]
+        lib.io_uring_cqe_seen.restype = None
+        return lib, Ring, Params, Cqe
+    return None
+
+
+def _mkdir_uring(paths: Sequence[Path], mode: int) -> list[int] | None:
+    import ctypes
+
+    loaded = _load_liburing()
+    if loaded is None:
+        return None
+    lib, ring_type, params_type, cqe_type = loaded
+
+    ring = ring_type()
+    params = params_type()
+    if lib.io_uring_queue_init_params(_RING_ENTRIES, ctypes.byref(ring), ctypes.byref(params)) < 0:
+        return None
+
+    # Slots that never get a completion keep -ECANCELED and are retried by
+    # the caller with os.mkdir.
+    results = [-errno.ECANCELED] * len(paths)
+    encoded = [os.fsencode(path) for path in paths]
+    cqe = ctypes.POINTER(cqe_type)()
+    try:
+        for start in range(0, len(encoded), BATCH_SIZE):
+            batch = encoded[start : start + BATCH_SIZE]
+            for offset, raw in enumerate(batch):
+                sqe = lib.io_uring_get_sqe(ring)
+                if not sqe:
+                    break
+                lib.io_uring_prep_mkdirat(sqe, AT_FDCWD, raw, mode)
+                lib.io_uring_sqe_set_data64(sqe, start + offset)
+            submitted = lib.io_uring_submit(ring)
+            if submitted < 0:
+                break
+            for _ in range(submitted):
+                if lib.io_uring_wait_cqe(ring, ctypes.byref(cqe)) < 0:
+                    return results
+                results[cqe.contents.user_data] = cqe.contents.res
+                lib.io_uring_cqe_seen(ring, cqe)
+    finally:
+        lib.io_uring_queue_exit(ring)
+    return results
+
+
+def _mkdir_python(path: Path, mode: int) -> int:
+    try:
+        os.mkdir(path, mode)
+    except OSError as exc:
+        return -(exc.errno or errno.EIO)
+    return 0
+
+
+def mkdir_batch(paths: Sequence[Path], mode: int = 0o777) -> set[Path]:
+    """Create each directory in ``paths`` and return the ones that were new.
+
+    Uses IORING_OP_MKDIRAT when liburing is available, submitting up to
+    ``BATCH_SIZE`` requests at a time. Anything the ring could not handle
+    (older kernels report ``-EINVAL``) is retried with ``os.mkdir``.
+    """
+    results = _mkdir_uring(paths, mode) if enabled() else None
+    if results is None:
+        results = [_mkdir_python(path, mode) for path in paths]
+
+    created: set[Path] = set()
+    for path, res in zip(paths, results):
+        if res not in (0, -errno.EEXIST):
+            res = _mkdir_python(path, mode)
+        if res == 0:
+            created.add(path)
+    return created
@@ -3,18 +3,206 @@
 from __future__ import annotations
 
 import argparse
-import shutil
+import itertools
+import os
+import re
 import sys
+import threading
 from dataclasses import dataclass
+from fnmatch import translate
+from functools import cache, partial
 from pathlib import Path
+from stat import S_ISREG
 from textwrap import dedent
-from typing import Iterable
+from typing import Callable, Iterable, Iterator
+
+from . import _uring
+
+DEFAULT_EXCLUDED_DIRS = frozenset({".git", ".hg", ".svn", "node_modules", "__pycache__"})
+
+_TAR_MODES = {"tar": "r:", "gztar": "r:gz", "bztar": "r:bz2", "xztar": "r:xz"}
+_MAGIC_PREFIXES = {
+    b"PK\x03\x04": "zip",
+    b"PK\x05\x06": "zip",
+    b"\x1f\x8b": "gztar",
+    b"BZh": "bztar",
+    b"\xfd7zXZ\x00": "xztar",
+    b"7z\xbc\xaf\x27\x1c": "7zip",
+    b"Rar!\x1a\x07": "rar",
+}
+_TAR_MAGIC_OFFSET = 257
+MAGIC_SIZE = 8
+COPY_BUFFER_SIZE = 1 << 20
+DRY_RUN_WORKERS = 16
+_THREAD_BUFFERS = threading.local()
+_TRASH_COUNTER = itertools.count(1)
+_TRASH_THREADS: list[threading.Thread] = []
+_TRASH_ERRORS: list[str] = []
+
+
+# shutil pulls in bz2/lzma/zlib and the unpackers need zipfile/tarfile, so the
+# format tables are built on first use rather than at import. That keeps
+# --help and argument errors from paying for the decompressors.
+@cache
+def _unpack_formats() -> dict[str, list[str]]:
+    import shutil
+
+    return {
+        name: [ext.lower() for ext in exts] for name, exts, _ in shutil.get_unpack_formats()
+    }
+
+
+@cache
+def _supported_extensions() -> list[str]:
+    exts = {ext for exts in _unpack_formats().values() for ext in exts}
+    return sorted(exts, key=len, reverse=True)
+
+
+@cache
+def _extension_tuple() -> tuple[str, ...]:
+    return tuple(_supported_extensions())
+
+
+@cache
+def _extension_index() -> tuple[frozenset[str], list[int]]:
+    exts = _supported_extensions()
+    return frozenset(exts), sorted({len(ext) for ext in exts}, reverse=True)
+
+
+@cache
+def _format_by_ext() -> dict[str, str]:
+    return {ext: name for name, exts in _unpack_formats().items() for ext in exts}
+
+
+@cache
+def _magic_formats() -> dict[bytes, str]:
+    formats = _unpack_formats()
+    return {magic: name for magic, name in _MAGIC_PREFIXES.items() if name in formats}
+
+
+@cache
+def _unpack_errors() -> tuple[type[BaseException], ...]:
+    import shutil
+    import tarfile
+    import zipfile
+
+    # Truncated and corrupt streams surface as the decompressor's own errors
+    # rather than the archive module's, so count those as failures too.
+    errors: list[type[BaseException]] = [
+        shutil.ReadError,
+        zipfile.BadZipFile,
+        tarfile.TarError,
+        ValueError,
+        OSError,
+        EOFError,
+    ]
+    try:
+        import zlib
+    except ImportError:
+        pass
+    else:
+        errors.append(zlib.error)
+    try:
+        import lzma
+    except ImportError:
+        pass
+    else:
+        errors.append(lzma.LZMAError)
+    return tuple(errors)
+
+
+def __getattr__(name: str) -> object:
+    if name == "SUPPORTED_EXTENSIONS":
+        return _supported_extensions()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _thread_buffer(name: str, size: int) -> bytearray:
+    buf = getattr(_THREAD_BUFFERS, name, None)
+    if buf is None:
+        buf = bytearray(size)
+        setattr(_THREAD_BUFFERS, name, buf)
+    return buf
+
+
+def _read_at(fd: int, buf: bytearray, offset: int) -> int:
+    if hasattr(os, "preadv"):
+        return os.preadv(fd, [buf], offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    data = os.read(fd, len(buf))
+    buf[: len(data)] = data
+    return len(data)
+
+
+def sniff_format(path: Path | str, dir_fd: int | None = None) -> str | None:
+    buf = _thread_buffer("magic", MAGIC_SIZE)
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0), dir_fd=dir_fd)
+    except OSError:
+        return None
+    try:
+        n = _read_at(fd, buf, 0)
+        for magic, name in _magic_formats().items():
+            if n >= len(magic) and buf.startswith(magic):
+                return name
+        if "tar" in _unpack_formats():
+            n = _read_at(fd, buf, _TAR_MAGIC_OFFSET)
+            if n >= 5 and buf.startswith(b"ustar"):
+                return "tar"
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    return None
+
 
-SUPPORTED_EXTENSIONS = sorted(
-    {ext.lower() for _, exts, _ in shutil.get_unpack_formats() for ext in exts},
-    key=len,
-    reverse=True,
-)
+def _unpack_zip(archive: Path, dest: Path) -> None:
+    import zipfile
+
+    buf = _thread_buffer("copy", COPY_BUFFER_SIZE)
+    view = memoryview(buf)
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            # Same member filtering as shutil's own zip unpacker.
+            if name.startswith("/") or ".." in name or os.path.isabs(name):
+                continue
+            target = os.path.join(dest, *name.split("/"))
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zf.open(info) as src, open(target, "wb") as dst:
+                while n := src.readinto(buf):
+                    dst.write(view[:n])
+
+
+def _unpack_tar(mode: str, archive: Path, dest: Path) -> None:
+    import tarfile
+
+    kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+    with tarfile.open(archive, mode, copybufsize=COPY_BUFFER_SIZE) as tf:
+        tf.extractall(dest, **kwargs)
+
+
+@cache
+def _unpackers() -> tuple[
+    dict[str, Callable[[Path, Path], None]], dict[str, Callable[[Path, Path], None]]
+]:
+    import shutil
+
+    by_format: dict[str, Callable[[Path, Path], None]] = {}
+    for name in _unpack_formats():
+        if name == "zip":
+            by_format[name] = _unpack_zip
+        elif name in _TAR_MODES:
+            by_format[name] = partial(_unpack_tar, _TAR_MODES[name])
+        else:
+            by_format[name] = partial(shutil.unpack_archive, format=name)
+    by_ext = {
+        ext: by_format[name] for name, exts in _unpack_formats().items() for ext in exts
+    }
+    return by_format, by_ext
 
 
 @dataclass
@@ -25,6 +213,11 @@ class ExtractionPlan:
     on_existing: str
     dry_run: bool
     pattern: str
+    exclude_dirs: frozenset[str] = DEFAULT_EXCLUDED_DIRS
+    include_hidden: bool = False
+    skip_archive_dirs: bool = False
+    sniff: bool = False
+    unsorted: bool = False
 
 
 @dataclass
@@ -46,7 +239,9 @@ def build_parser() -> argparse.ArgumentParser:
             """
         ),
     )
-    parser.add_argument("--input", "-i", type=Path, help="Directory containing archives")
+    parser.add_argument(
+        "--input", "-i", type=Path, help="Directory containing archives, or a single archive"
+    )
     parser.add_argument("--output", "-o", type=Path, help="Base directory for extraction")
     parser.add_argument(
         "--recursive", "-r", action="store_true", help="Scan subdirectories"
@@ -54,7 +249,34 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument(
         "--pattern",
         default="*",
-        help="Glob pattern to filter files before archive detection",
+        help="Glob pattern matched against file names (not paths) before archive detection",
+    )
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help="Directory name to skip when scanning recursively (repeatable)",
+    )
+    parser.add_argument(
+        "--include-hidden",
+        action="store_true",
+        help="Descend into hidden directories when scanning recursively",
+    )
+    parser.add_argument(
+        "--skip-archive-dirs",
+        action="store_true",
+        help="Do not descend into directories named like archives (e.g. foo.zip/)",
+    )
+    parser.add_argument(
+        "--sniff",
+        action="store_true",
+        help="Detect archives by their magic bytes instead of trusting extensions",
+    )
+    parser.add_argument(
+        "--unsorted",
+        action="store_true",
+        help="Process archives in filesystem order instead of by name",
     )
     parser.add_argument(
         "--on-existing",
@@ -76,7 +298,7 @@ def print_header() -> None:
     print("UNZIP_CX — Automatic Batch Decompression")
     print("=" * 68)
     print("Supported formats:")
-    print("  " + ", ".join(SUPPORTED_EXTENSIONS))
+    print("  " + ", ".join(_supported_extensions()))
     print()
 
 
@@ -116,59 +338,228 @@ def normalize_path(value: str, fallback: Path) -> Path:
     return Path(cleaned).expanduser().resolve()
 
 
-def archive_stem(path: Path) -> str:
-    name = path.name
+def match_extension(name: str) -> str | None:
+    ext_set, ext_lengths = _extension_index()
     lower_name = name.lower()
-    for ext in SUPPORTED_EXTENSIONS:
-        if lower_name.endswith(ext):
-            return name[: -len(ext)]
-    return path.stem
+    for n in ext_lengths:
+        suffix = lower_name[-n:]
+        if suffix in ext_set:
+            return suffix
+    return None
+
+
+def should_descend(name: str, plan: ExtractionPlan) -> bool:
+    if name in plan.exclude_dirs:
+        return False
+    if name.startswith(".") and not plan.include_hidden:
+        return False
+    if plan.skip_archive_dirs and name.lower().endswith(_extension_tuple()):
+        return False
+    return True
+
+
+NameMatcher = Callable[[str], object]
+
+
+def pattern_error(pattern: str) -> str | None:
+    if "/" in pattern or os.sep in pattern:
+        return (
+            f"Pattern {pattern!r} contains a path separator; patterns match file "
+            "names only (use --recursive to scan subdirectories)."
+        )
+    return None
+
+
+def compile_pattern(pattern: str) -> NameMatcher | None:
+    # Compiled once per scan; "*" matches every name, so it needs no check.
+    if pattern == "*":
+        return None
+    return re.compile(translate(pattern)).match
+
 
+def _archive_candidate(
+    name: str, plan: ExtractionPlan, pattern_match: NameMatcher | None
+) -> str | None:
+    if pattern_match is not None and not pattern_match(name):
+        return None
+    ext = match_extension(name)
+    if ext is None:
+        return "" if plan.sniff else None
+    return ext
+
+
+def _fwalk_archives(
+    plan: ExtractionPlan, pattern_match: NameMatcher | None
+) -> list[tuple[Path, str, str | None]]:
+    archives: list[tuple[Path, str, str | None]] = []
+    for dirpath, dirnames, filenames, dirfd in os.fwalk(plan.input_dir, follow_symlinks=False):
+        dirnames[:] = [name for name in dirnames if should_descend(name, plan)]
+        found: list[tuple[str, str, str | None]] = []
+        for name in filenames:
+            ext = _archive_candidate(name, plan, pattern_match)
+            if ext is None:
+                continue
+            try:
+                st = os.stat(name, dir_fd=dirfd)
+            except OSError:
+                continue
+            if not S_ISREG(st.st_mode):
+                continue
+            fmt = sniff_format(name, dir_fd=dirfd) if plan.sniff else None
+            if plan.sniff and fmt is None:
+                continue
+            found.append((name, ext, fmt))
+        if not plan.unsorted:
+            dirnames.sort()
+            found.sort()
+        archives.extend((Path(dirpath, name), ext, fmt) for name, ext, fmt in found)
+    return archives
+
+
+def _scandir_archives(
+    plan: ExtractionPlan, pattern_match: NameMatcher | None
+) -> list[tuple[Path, str, str | None]]:
+    archives: list[tuple[Path, str, str | None]] = []
+    pending = [plan.input_dir]
+    while pending:
+        directory = pending.pop()
+        found: list[tuple[str, str, str | None]] = []
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if plan.recursive and should_descend(entry.name, plan):
+                            subdirs.append(entry.name)
+                        continue
+                    ext = _archive_candidate(entry.name, plan, pattern_match)
+                    if ext is None or not entry.is_file():
+                        continue
+                    fmt = sniff_format(entry.path) if plan.sniff else None
+                    if plan.sniff and fmt is None:
+                        continue
+                    found.append((entry.name, ext, fmt))
+        except OSError:
+            continue
+        if not plan.unsorted:
+            found.sort()
+            subdirs.sort(reverse=True)
+        archives.extend((directory / name, ext, fmt) for name, ext, fmt in found)
+        pending.extend(directory / name for name in subdirs)
+    return archives
+
+
+def collect_archives(plan: ExtractionPlan) -> list[tuple[Path, str, str | None]]:
+    """Return ``(path, matched_extension, sniffed_format)`` for every archive found.
+
+    The extension is ``""`` for files that were only recognised by ``--sniff``,
+    and the format is ``None`` unless ``--sniff`` read it from the file.
+    Unless ``plan.unsorted`` is set, each directory's archives are listed by
+    name before its subdirectories are visited in name order.
+    """
+    pattern_match = compile_pattern(plan.pattern)
+    if plan.recursive and hasattr(os, "fwalk"):
+        return _fwalk_archives(plan, pattern_match)
+    return _scandir_archives(plan, pattern_match)
+
+
+def next_free_name(dest: Path, reserved: Iterable[str] = ()) -> str:
+    reserved = set(reserved)
+    try:
+        with os.scandir(dest.parent) as entries:
+            taken = {entry.name for entry in entries} | reserved
+    except OSError:
+        counter = 1
+        while (
+            f"{dest.name}_{counter}" in reserved
+            or (dest.parent / f"{dest.name}_{counter}").exists()
+        ):
+            counter += 1
+        return f"{dest.name}_{counter}"
 
-def collect_archives(plan: ExtractionPlan) -> list[Path]:
-    glob = plan.input_dir.rglob if plan.recursive else plan.input_dir.glob
-    candidates = [p for p in glob(plan.pattern) if p.is_file()]
-    archives: list[Path] = []
-    for path in candidates:
-        lower_name = path.name.lower()
-        if any(lower_name.endswith(ext) for ext in SUPPORTED_EXTENSIONS):
-            archives.append(path)
-    return sorted(archives)
+    counter = 1
+    while f"{dest.name}_{counter}" in taken:
+        counter += 1
+    return f"{dest.name}_{counter}"
 
 
-def ensure_destination(dest: Path, on_existing: str) -> Path | None:
+def ensure_destination(dest: Path, on_existing: str, dry_run: bool = False) -> Path | None:
+    # A dry run resolves the same destination without touching the disk.
     if not dest.exists():
-        dest.mkdir(parents=True, exist_ok=True)
+        if not dry_run:
+            dest.mkdir(parents=True, exist_ok=True)
         return dest
 
     if on_existing == "skip":
         return None
 
     if on_existing == "overwrite":
+        if dry_run:
+            return dest
+
+        import shutil
+
+        # Only a real directory is moved aside; symlinks keep pointing where
+        # the user set them and are cleared in place, like the old behaviour.
+        if dest.is_dir() and not dest.is_symlink():
+            trash = dest.parent / f".{dest.name}.trash-{os.getpid()}-{next(_TRASH_COUNTER)}"
+            try:
+                os.rename(dest, trash)
+            except OSError:
+                pass
+            else:
+                dest.mkdir()
+                thread = threading.Thread(target=_delete_trash, args=(trash,), daemon=False)
+                thread.start()
+                _TRASH_THREADS.append(thread)
+                return dest
+
         for child in dest.iterdir():
-            if child.is_dir():
+            if child.is_dir() and not child.is_symlink():
                 shutil.rmtree(child)
             else:
                 child.unlink()
         return dest
 
     if on_existing == "rename":
-        counter = 1
-        while True:
-            candidate = dest.parent / f"{dest.name}_{counter}"
-            if not candidate.exists():
-                candidate.mkdir(parents=True, exist_ok=True)
-                return candidate
-            counter += 1
+        candidate = dest.parent / next_free_name(dest)
+        if not dry_run:
+            candidate.mkdir(parents=True, exist_ok=True)
+        return candidate
 
     return None
 
 
+def _delete_trash(trash: Path) -> None:
+    import shutil
+
+    errors: list[str] = []
+
+    def record(func: object, path: str, exc: object) -> None:
+        if isinstance(exc, tuple):
+            exc = exc[1]
+        errors.append(f"{path}: {exc}")
+
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(trash, onexc=record)
+    else:
+        shutil.rmtree(trash, onerror=record)
+    if errors:
+        _TRASH_ERRORS.append(f"Could not fully remove {trash} ({errors[0]})")
+
+
+def wait_for_trash() -> None:
+    while _TRASH_THREADS:
+        _TRASH_THREADS.pop().join()
+    while _TRASH_ERRORS:
+        print(f"Warning: {_TRASH_ERRORS.pop(0)}", file=sys.stderr)
+
+
 def handle_existing_dest(
-    dest: Path, on_existing: str
+    dest: Path, on_existing: str, dry_run: bool = False
 ) -> tuple[Path | None, str]:
     if not dest.exists() or on_existing != "ask":
-        return ensure_destination(dest, on_existing), on_existing
+        return ensure_destination(dest, on_existing, dry_run), on_existing
 
     print(f"Destination already exists: {dest}")
     choice = prompt_choice(
@@ -178,35 +569,202 @@ def handle_existing_dest(
     )
     if choice.endswith("-all"):
         resolved = choice.replace("-all", "")
-        return ensure_destination(dest, resolved), resolved
-    return ensure_destination(dest, choice), on_existing
-
-
-def extract_archives(plan: ExtractionPlan, archives: list[Path]) -> ExtractionResult:
+        return ensure_destination(dest, resolved, dry_run), resolved
+    return ensure_destination(dest, choice, dry_run), on_existing
+
+
+def _unpack_one(
+    archive: Path, dest: Path, ext: str | None = None, fmt: str | None = None
+) -> tuple[Path, str | None]:
+    import shutil
+
+    # A sniffed format describes the contents, so it wins over the extension.
+    by_format, by_ext = _unpackers()
+    if fmt:
+        unpack = by_format.get(fmt)
+    else:
+        if ext is None:
+            ext = match_extension(archive.name)
+        if ext:
+            unpack = by_ext.get(ext)
+        else:
+            name = sniff_format(archive)
+            unpack = by_format.get(name) if name else None
+    try:
+        if unpack is None:
+            shutil.unpack_archive(str(archive), str(dest))
+        else:
+            unpack(archive, dest)
+    except _unpack_errors() as exc:
+        return archive, str(exc)
+    return archive, None
+
+
+def _prefetch(path: Path) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _run_worklist(
+    worklist: list[tuple[Path, Path, str, str | None]]
+) -> Iterator[list[tuple[Path, str | None]]]:
+    # Outcomes are yielded in batches of whatever finished together so the
+    # caller can report them with one write. While one archive is being
+    # unpacked, ask the kernel to start reading the next one to be picked up.
+    workers = min(len(worklist), os.cpu_count() or 1)
+    if workers <= 1:
+        for idx, work in enumerate(worklist):
+            if idx + 1 < len(worklist):
+                _prefetch(worklist[idx + 1][0])
+            yield [_unpack_one(*work)]
+        return
+
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    # Overwrite deletions may still be running on background threads, and
+    # forking a threaded process can deadlock, so never use the fork method.
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        pending = {executor.submit(_unpack_one, *work) for work in worklist}
+        prefetched = min(len(worklist), workers * 2)
+        for archive, *_ in worklist[workers:prefetched]:
+            _prefetch(archive)
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            upcoming = min(len(worklist), prefetched + len(finished))
+            for archive, *_ in worklist[prefetched:upcoming]:
+                _prefetch(archive)
+            prefetched = upcoming
+            yield [future.result() for future in finished]
+
+
+def _check_one(archive: Path, ext: str, fmt: str | None = None) -> str | None:
+    import tarfile
+    import zipfile
+
+    name = fmt or (_format_by_ext().get(ext) if ext else sniff_format(archive))
+    try:
+        if name == "zip":
+            readable = zipfile.is_zipfile(archive)
+        elif name in _TAR_MODES:
+            readable = tarfile.is_tarfile(archive)
+        else:
+            # Formats registered by third-party packages cannot be probed here.
+            return None
+    except OSError as exc:
+        return str(exc)
+    return None if readable else f"not a readable {name} archive"
+
+
+def _check_worklist(
+    worklist: list[tuple[Path, Path, str, str | None]]
+) -> Iterator[str | None]:
+    # The checks are a stat and a short read each, so threads overlap the
+    # waits without the cost of a process pool.
+    if len(worklist) <= 1:
+        for archive, _, ext, fmt in worklist:
+            yield _check_one(archive, ext, fmt)
+        return
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(len(worklist), DRY_RUN_WORKERS)) as executor:
+        archives = [archive for archive, _, _, _ in worklist]
+        exts = [ext for _, _, ext, _ in worklist]
+        fmts = [fmt for _, _, _, fmt in worklist]
+        yield from executor.map(_check_one, archives, exts, fmts)
+
+
+def _write_lines(lines: list[str]) -> None:
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        lines.clear()
+
+
+def extract_archives(
+    plan: ExtractionPlan, archives: list[tuple[Path, str, str | None]]
+) -> ExtractionResult:
     extracted = skipped = failed = 0
     on_existing = plan.on_existing
-
-    for idx, archive in enumerate(archives, start=1):
-        stem = archive_stem(archive)
-        dest = plan.output_dir / stem
-        resolved_dest, on_existing = handle_existing_dest(dest, on_existing)
+    total = len(archives)
+    done = 0
+    lines: list[str] = []
+
+    # Destinations are resolved up front and in order so the "ask" prompts and
+    # the "*-all" choices stay on the main thread.
+    dests = [
+        plan.output_dir / (archive.name[: -len(ext)] if ext else archive.stem)
+        for archive, ext, _ in archives
+    ]
+    precreated: set[Path] = set()
+    if not plan.dry_run and len(dests) > _uring.MIN_PATHS and _uring.enabled():
+        precreated = _uring.mkdir_batch(list(dict.fromkeys(dests)))
+
+    # Archives sharing a stem (a.zip, a.tar) map to the same folder. Each
+    # folder goes to one archive per run so that no two workers ever write
+    # into it; later ones are skipped or renamed instead of overwriting it.
+    claimed: set[Path] = set()
+    worklist: list[tuple[Path, Path, str, str | None]] = []
+    for (archive, ext, fmt), dest in zip(archives, dests):
+        if dest in claimed:
+            if on_existing == "skip":
+                resolved_dest = None
+            else:
+                resolved_dest = dest.parent / next_free_name(dest, (p.name for p in claimed))
+                if not plan.dry_run:
+                    resolved_dest.mkdir(parents=True, exist_ok=True)
+        elif dest in precreated:
+            precreated.discard(dest)
+            resolved_dest = dest
+        else:
+            if on_existing == "ask":
+                _write_lines(lines)
+            resolved_dest, on_existing = handle_existing_dest(dest, on_existing, plan.dry_run)
+        claimed.add(dest)
         if resolved_dest is None:
             skipped += 1
-            print(f"[{idx}/{len(archives)}] Skipped {archive.name}")
+            done += 1
+            lines.append(f"[{done}/{total}] Skipped {archive.name}")
             continue
 
-        if plan.dry_run:
-            extracted += 1
-            print(f"[{idx}/{len(archives)}] (dry-run) {archive.name} -> {resolved_dest}")
-            continue
+        claimed.add(resolved_dest)
+        worklist.append((archive, resolved_dest, ext, fmt))
+    _write_lines(lines)
 
-        try:
-            shutil.unpack_archive(str(archive), str(resolved_dest))
-            extracted += 1
-            print(f"[{idx}/{len(archives)}] Extracted {archive.name}")
-        except (shutil.ReadError, ValueError, OSError) as exc:
-            failed += 1
-            print(f"[{idx}/{len(archives)}] Failed {archive.name}: {exc}")
+    if plan.dry_run:
+        for (archive, resolved_dest, *_), error in zip(worklist, _check_worklist(worklist)):
+            done += 1
+            if error is None:
+                extracted += 1
+                lines.append(f"[{done}/{total}] (dry-run) {archive.name} -> {resolved_dest}")
+            else:
+                failed += 1
+                lines.append(f"[{done}/{total}] (dry-run) Failed {archive.name}: {error}")
+        _write_lines(lines)
+        return ExtractionResult(extracted=extracted, skipped=skipped, failed=failed)
+
+    for batch in _run_worklist(worklist):
+        for archive, error in batch:
+            done += 1
+            if error is None:
+                extracted += 1
+                lines.append(f"[{done}/{total}] Extracted {archive.name}")
+            else:
+                failed += 1
+                lines.append(f"[{done}/{total}] Failed {archive.name}: {error}")
+        _write_lines(lines)
 
     return ExtractionResult(extracted=extracted, skipped=skipped, failed=failed)
 
@@ -218,7 +776,12 @@ def interactive_plan() -> ExtractionPlan:
     output_default = input_dir / "extracted"
     output_dir = normalize_path(prompt("Output folder", str(output_default)), output_default)
     recursive = prompt_yes_no("Scan subfolders", default=False)
-    pattern = prompt("File glob pattern", "*")
+    while True:
+        pattern = prompt("File name pattern", "*")
+        error = pattern_error(pattern)
+        if error is None:
+            break
+        print(error)
     on_existing = prompt_choice(
         "If destination exists",
         ["ask", "skip", "overwrite", "rename"],
@@ -257,12 +820,66 @@ def plan_from_args(args: argparse.Namespace) -> ExtractionPlan:
         on_existing=args.on_existing,
         dry_run=args.dry_run,
         pattern=args.pattern,
+        exclude_dirs=DEFAULT_EXCLUDED_DIRS | set(args.exclude_dir),
+        include_hidden=args.include_hidden,
+        skip_archive_dirs=args.skip_archive_dirs,
+        sniff=args.sniff,
+        unsorted=args.unsorted,
     )
 
 
+def _extract_single(
+    archive: Path, ext: str, fmt: str | None, dest: Path, on_existing: str, dry_run: bool
+) -> int:
+    try:
+        resolved_dest, _ = handle_existing_dest(dest, on_existing, dry_run)
+        if resolved_dest is None:
+            print(f"Skipped {archive.name}")
+            return 0
+
+        if dry_run:
+            error = _check_one(archive, ext, fmt)
+            if error is not None:
+                print(f"(dry-run) Failed {archive.name}: {error}")
+                return 1
+            print(f"(dry-run) {archive.name} -> {resolved_dest}")
+            return 0
+
+        _, error = _unpack_one(archive, resolved_dest, ext, fmt)
+    finally:
+        wait_for_trash()
+    if error is not None:
+        print(f"Failed {archive.name}: {error}")
+        return 1
+    print(f"Extracted {archive.name} -> {resolved_dest}")
+    return 0
+
+
 def main(argv: list[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
+    error = pattern_error(args.pattern)
+    if error is not None:
+        parser.error(error)
+
+    if not args.interactive and args.input is not None:
+        archive = args.input.expanduser()
+        ext = match_extension(archive.name)
+        if (ext is not None or args.sniff) and archive.is_file():
+            # Apply the same filters a directory scan would.
+            pattern_match = compile_pattern(args.pattern)
+            fmt = sniff_format(archive) if args.sniff else None
+            if (pattern_match is not None and not pattern_match(archive.name)) or (
+                args.sniff and fmt is None
+            ):
+                print("No supported archives found.")
+                return 0
+            archive = archive.resolve()
+            output_dir = (args.output or archive.parent / "extracted").expanduser().resolve()
+            dest = output_dir / (archive.name[: -len(ext)] if ext else archive.stem)
+            return _extract_single(
+                archive, ext or "", fmt, dest, args.on_existing, args.dry_run
+            )
 
     interactive = args.interactive or not (args.input or args.output)
     plan = interactive_plan() if interactive else plan_from_args(args)
@@ -276,7 +893,8 @@ def main(argv: list[str] | None = None) -> int:
         print("No supported archives found.")
         return 0
 
-    plan.output_dir.mkdir(parents=True, exist_ok=True)
+    if not plan.dry_run:
+        plan.output_dir.mkdir(parents=True, exist_ok=True)
     print(f"Found {len(archives)} archives. Starting extraction...\n")
     result = extract_archives(plan, archives)
 
@@ -284,6 +902,7 @@ def main(argv: list[str] | None = None) -> int:
     print(f"  Extracted: {result.extracted}")
     print(f"  Skipped:   {result.skipped}")
     print(f"  Failed:    {result.failed}")
+    wait_for_trash()
     return 0 if result.failed == 0 else 1
 
 